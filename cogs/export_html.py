@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import html
 import io
+import itertools
 import re
 from datetime import datetime, timezone, timedelta
 
@@ -12,22 +14,25 @@ from discord.ext import commands
 # =====================
 # 日本時間（JST）
 # =====================
-JST = timezone(timedelta(hours=9))
+_JST_OFFSET = timedelta(hours=9)  # Asia/Tokyo は夏時間なしの固定 UTC+9
+JST = timezone(_JST_OFFSET)
 
 DEFAULT_LIMIT = 200
 MAX_LIMIT = 5000
 TIME_FORMAT = "%Y-%m-%d %H:%M"
 
 SAFE_MAX_BYTES = 8 * 1024 * 1024 - 200_000  # 8MB未満に収める安全値（Nitro無し想定）
+MIN_SHRINK_LIMIT = 50  # サイズ超過で件数を減らすときの下限
+
+# レンダリング中、この件数ごとにイベントループへ制御を返す（ハートビート詰まり防止）
+RENDER_YIELD_EVERY = 100
 
 # URLは「URL文字列を表示したまま」クリックできるようにする
 # 末尾の ) ] } などを巻き込みにくい版
 URL_RE = re.compile(r"(https?://[^\s<>()\]\}]+)")
 
-# Discord内部メンション表現
-USER_MENTION_RE = re.compile(r"<@!?(\d+)>")
-ROLE_MENTION_RE = re.compile(r"<@&(\d+)>")
-CHANNEL_MENTION_RE = re.compile(r"<#(\d+)>")
+# Discord内部メンション表現（<@id> <@!id> <@&id> <#id>）の ID 桁数上限
+_MENTION_ID_MAX_DIGITS = 20
 
 # インライン装飾（コードブロック外で適用）
 BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
@@ -37,8 +42,16 @@ STRIKE_RE = re.compile(r"~~(.+?)~~")
 ITALIC_ASTER_RE = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
 ITALIC_UNDER_RE = re.compile(r"(?<!_)_(?!_)(.+?)(?<!_)_(?!_)")
 
+# 通常メンション色（@表示名 / @ロール / #チャンネル等）
+NAME_MENTION_RE = re.compile(r"(?<!<)(?<![\w/])(@[^\s<]+)")
+CHANNEL_NAME_MENTION_RE = re.compile(r"(?<!<)(?<![\w/])(#\S+)")
+
+# ```lang の言語指定っぽい1行目
+CODE_LANG_RE = re.compile(r"[A-Za-z0-9_+\-#.]+")
+
 
-def make_html_page(guild_name: str, channel_name: str, exported_at: str, messages_html: str) -> str:
+def make_html_head(guild_name: str, channel_name: str, exported_at: str) -> str:
+    """メッセージ部分の直前までのHTML。メッセージ本体と HTML_TAIL で挟んで1ページになる。"""
     return f"""<!doctype html>
 <html lang="ja">
 <head>
@@ -223,12 +236,16 @@ def make_html_page(guild_name: str, channel_name: str, exported_at: str, message
       <div class="meta">Exported at: {html.escape(exported_at)}（JST）</div>
     </div>
     <div class="chat">
-      {messages_html}
+      """
+
+
+HTML_TAIL = """
     </div>
   </div>
 </body>
 </html>
 """
+_HTML_TAIL_BYTES = HTML_TAIL.encode("utf-8")
 
 
 def _display_user(guild: discord.Guild | None, user_id: int) -> str:
@@ -254,10 +271,50 @@ def _display_channel(guild: discord.Guild | None, channel_id: int) -> str:
 
 
 def replace_discord_mentions_to_names(raw: str, guild: discord.Guild | None) -> str:
-    raw = USER_MENTION_RE.sub(lambda m: _display_user(guild, int(m.group(1))), raw)
-    raw = ROLE_MENTION_RE.sub(lambda m: _display_role(guild, int(m.group(1))), raw)
-    raw = CHANNEL_MENTION_RE.sub(lambda m: _display_channel(guild, int(m.group(1))), raw)
-    return raw
+    """
+    <@id> / <@!id> / <@&id> / <#id> を1パスで表示名に置換する。
+    正規表現は使わず、"<" の位置から直接読み取る。
+    """
+    out: list[str] = []
+    start = 0
+    i = raw.find("<")
+
+    while i >= 0:
+        k = i + 1
+        kind = raw[k:k + 1]
+        if kind == "@":
+            k += 1
+            flag = raw[k:k + 1]
+            if flag == "&":
+                k += 1
+                resolve = _display_role
+            else:
+                if flag == "!":
+                    k += 1
+                resolve = _display_user
+        elif kind == "#":
+            k += 1
+            resolve = _display_channel
+        else:
+            i = raw.find("<", i + 1)
+            continue
+
+        # ID は数字のみ（Discordのsnowflakeは最大20桁）
+        end = raw.find(">", k, k + _MENTION_ID_MAX_DIGITS + 1)
+        num = raw[k:end] if end >= 0 else ""
+        if not (num.isascii() and num.isdigit()):
+            i = raw.find("<", i + 1)
+            continue
+
+        out.append(raw[start:i])
+        out.append(resolve(guild, int(num)))
+        start = end + 1
+        i = raw.find("<", start)
+
+    if not out:
+        return raw
+    out.append(raw[start:])
+    return "".join(out)
 
 
 def linkify_escaped(escaped_text: str) -> str:
@@ -285,8 +342,8 @@ def apply_inline_formatting(escaped_text: str) -> str:
     escaped_text = ITALIC_UNDER_RE.sub(r"<em>\1</em>", escaped_text)
 
     # 通常メンション色（@表示名 / @ロール / #チャンネル等）
-    escaped_text = re.sub(r'(?<!<)(?<![\w/])(@[^\s<]+)', r'<span class="mention">\1</span>', escaped_text)
-    escaped_text = re.sub(r'(?<!<)(?<![\w/])(#\S+)', r'<span class="mention">\1</span>', escaped_text)
+    escaped_text = NAME_MENTION_RE.sub(r'<span class="mention">\1</span>', escaped_text)
+    escaped_text = CHANNEL_NAME_MENTION_RE.sub(r'<span class="mention">\1</span>', escaped_text)
 
     return escaped_text
 
@@ -315,7 +372,7 @@ def render_discord_markdown(raw_text: str, guild: discord.Guild | None) -> str:
             if "\n" in code:
                 first, rest = code.split("\n", 1)
                 # 言語指定っぽいなら採用（Discordっぽく）
-                if len(first) <= 20 and re.fullmatch(r"[A-Za-z0-9_+\-#.]+", first.strip() or ""):
+                if len(first) <= 20 and CODE_LANG_RE.fullmatch(first.strip()):
                     lang = first.strip()
                     code = rest
 
@@ -405,7 +462,10 @@ def msg_to_html(m: discord.Message) -> str:
     author = m.author
     avatar_url = author.display_avatar.url if author.display_avatar else ""
     author_name = author.display_name
-    time_str = m.created_at.astimezone(JST).strftime(TIME_FORMAT)
+    # TIME_FORMAT と同じ書式。strftime（libc + ロケール参照）をメッセージ毎に通さない
+    # created_at は UTC aware。固定オフセットを足すだけで JST の壁時計になる（tzinfo は表示に使わない）
+    dt = m.created_at + _JST_OFFSET
+    time_str = f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
 
     body_html = render_discord_markdown(m.content or "", m.guild)
     attach_html = attachments_to_html(m)
@@ -425,6 +485,19 @@ def msg_to_html(m: discord.Message) -> str:
     """
 
 
+async def render_message_fragments(msgs: list[discord.Message]) -> list[bytes]:
+    """
+    メッセージごとのHTML（UTF-8）を1回だけ生成する。
+    CPUを握り続けないよう定期的に await を挟む。
+    """
+    frags: list[bytes] = []
+    for i, m in enumerate(msgs, 1):
+        frags.append(msg_to_html(m).encode("utf-8"))
+        if i % RENDER_YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+    return frags
+
+
 def make_filename(channel_name: str) -> str:
     def safe(s: str) -> str:
         return re.sub(r"[^\w\-]+", "_", s)
@@ -486,49 +559,49 @@ class ExportHtmlCog(commands.Cog):
         guild_name = ctx.guild.name if ctx.guild else "DM"
         filename = make_filename(channel.name)
 
-        # サイズ超過なら自動で件数を減らす
-        current = limit
-        while True:
-            msgs: list[discord.Message] = []
-            try:
-                async for m in channel.history(limit=current, oldest_first=True):
-                    msgs.append(m)
-            except discord.Forbidden:
-                await ctx.reply("⚠️ メッセージ履歴を読む権限がありません（Read Message History）。")
-                return
-            except discord.HTTPException as e:
-                await ctx.reply(f"⚠️ Discord API エラーで履歴取得に失敗しました：{e}")
-                return
-
-            messages_html = "\n".join(msg_to_html(m) for m in msgs)
-
-            exported_at = datetime.now(JST).strftime("%Y-%m-%d %H:%M:%S")
-            page = make_html_page(
-                guild_name=guild_name,
-                channel_name=channel.name,
-                exported_at=exported_at,
-                messages_html=messages_html,
+        msgs: list[discord.Message] = []
+        try:
+            async for m in channel.history(limit=limit, oldest_first=True):
+                msgs.append(m)
+        except discord.Forbidden:
+            await ctx.reply("⚠️ メッセージ履歴を読む権限がありません（Read Message History）。")
+            return
+        except discord.HTTPException as e:
+            await ctx.reply(f"⚠️ Discord API エラーで履歴取得に失敗しました：{e}")
+            return
+
+        # 各メッセージは1回だけレンダリングし、サイズ超過時は収まる最大件数を二分探索で選ぶ
+        frags = await render_message_fragments(msgs)
+
+        exported_at = datetime.now(JST).strftime("%Y-%m-%d %H:%M:%S")
+        head = make_html_head(
+            guild_name=guild_name,
+            channel_name=channel.name,
+            exported_at=exported_at,
+        ).encode("utf-8")
+
+        # prefix[i] = 先頭 i+1 件ぶんのバイト数（区切りの "\n" 込み。tail 前の区切りは予算側で引く）
+        prefix = list(itertools.accumulate(len(f) + 1 for f in frags))
+        budget = SAFE_MAX_BYTES - len(head) - len(_HTML_TAIL_BYTES) - 1
+        count = bisect.bisect_right(prefix, budget)
+
+        if count < min(len(frags), MIN_SHRINK_LIMIT):
+            await ctx.send(
+                "⚠️ HTMLが大きすぎて添付できません。\n"
+                "画像/リアクション/コードなどで8MBを超える場合があります。`!export 100` など件数を減らして試してください。"
             )
-            data = page.encode("utf-8")
-
-            if len(data) <= SAFE_MAX_BYTES:
-                try:
-                    file = discord.File(fp=io.BytesIO(data), filename=filename)
-                    await ctx.send(f"✅ HTMLログを生成しました（{current}件）", file=file)
-                except discord.Forbidden:
-                    await ctx.reply("⚠️ 送信/添付権限がありません（Send Messages / Attach Files）。")
-                except discord.HTTPException as e:
-                    await ctx.reply(f"⚠️ ファイル送信に失敗しました：{e}")
-                return
-
-            if current <= 50:
-                await ctx.send(
-                    "⚠️ HTMLが大きすぎて添付できません。\n"
-                    "画像/リアクション/コードなどで8MBを超える場合があります。`!export 100` など件数を減らして試してください。"
-                )
-                return
-
-            current = max(50, current // 2)
+            return
+
+        # head / 各メッセージ / tail を1回の join で連結（中間コピーなし。BytesIO はこの bytes をそのまま共有する）
+        data = b"\n".join(itertools.chain((head,), frags[:count], (_HTML_TAIL_BYTES,)))
+
+        try:
+            file = discord.File(fp=io.BytesIO(data), filename=filename)
+            await ctx.send(f"✅ HTMLログを生成しました（{count}件）", file=file)
+        except discord.Forbidden:
+            await ctx.reply("⚠️ 送信/添付権限がありません（Send Messages / Attach Files）。")
+        except discord.HTTPException as e:
+            await ctx.reply(f"⚠️ ファイル送信に失敗しました：{e}")
 
 
 async def setup(bot: commands.Bot):
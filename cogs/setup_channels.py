@@ -1,71 +1,112 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import os
-from typing import Dict, Optional, List
+import re
+from pathlib import Path
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 import discord
 from discord.ext import commands
+import orjson
 
 import config
 
 DB_PATH = os.path.join("data", "setup_channels_db.json")
 JST = ZoneInfo("Asia/Tokyo")
 
+# DB変更後、まとめて書き込むまでの待ち時間（秒）
+SAVE_DELAY_SEC = 2.0
+
+# 削除ボタンの custom_id（全チャンネル共通）。旧形式は "setup:delete:{channel_id}"
+DELETE_CUSTOM_ID = "setup:delete"
+LEGACY_DELETE_CUSTOM_ID_PREFIX = "setup:delete:"
+
+# 個別ch作成の同時実行数（Discordのチャンネル作成レート制限に合わせる）
+CREATE_CONCURRENCY = 2
+
 
 # -----------------------
 # DB helpers
 # -----------------------
 def _ensure_db():
     os.makedirs("data", exist_ok=True)
-    if not os.path.exists(DB_PATH):
-        with open(DB_PATH, "w", encoding="utf-8") as f:
-            json.dump({}, f)
 
 
 def _load_db() -> Dict[str, dict]:
-    _ensure_db()
     try:
-        with open(DB_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
+        return orjson.loads(Path(DB_PATH).read_bytes())
+    except FileNotFoundError:
         return {}
+    except orjson.JSONDecodeError as e:
+        # 黙って {} にすると全チャンネルの管理情報が消えるので、起動を止めて気付けるようにする
+        raise RuntimeError(f"{DB_PATH} を読み込めません（JSONが壊れています）: {e}") from e
+
 
+def _dumps_db(db: Dict[int, dict]) -> bytes:
+    # orjson は最小形の UTF-8 bytes を1回で返す（int キーは文字列キーとして書き出す）
+    return orjson.dumps(db, option=orjson.OPT_NON_STR_KEYS)
 
-def _save_db(db: Dict[str, dict]) -> None:
+
+def _write_db(data: bytes) -> None:
+    # 一時ファイルに書いてから置き換える（書き込み途中で落ちても DB_PATH は壊れない）
     _ensure_db()
-    with open(DB_PATH, "w", encoding="utf-8") as f:
-        json.dump(db, f, ensure_ascii=False, indent=2)
+    tmp = DB_PATH + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())  # 中身をディスクに載せてから rename（電源断で空ファイルにならない）
+    os.replace(tmp, DB_PATH)
+
+
+async def _asave_db(db: Dict[int, dict]) -> None:
+    """直列化はループ上（その時点のスナップショット）、ファイル書き込みはスレッドで行う。"""
+    data = _dumps_db(db)
+    await asyncio.to_thread(_write_db, data)
+
+
+# 管理者 or チャンネル管理のビット（どちらか立っていれば管理者扱い）
+_ADMINISH_MASK = discord.Permissions(administrator=True, manage_channels=True).value
 
 
 def _is_adminish(member: discord.Member) -> bool:
-    p = member.guild_permissions
-    return p.administrator or p.manage_channels
+    return bool(member.guild_permissions.value & _ADMINISH_MASK)
+
+
+# -----------------------
+# Permission templates
+# -----------------------
+# 中身は変更しないので全チャンネル・全メンバーで同じインスタンスを共有する
+_OW_HIDDEN = discord.PermissionOverwrite(view_channel=False)
+_OW_MEMBER = discord.PermissionOverwrite(view_channel=True, read_message_history=True, send_messages=True)
 
 
 # -----------------------
 # Naming
 # -----------------------
-def _shared_channel_title(session_no: int) -> str:
-    now = datetime.now(JST)
-    return f"session{session_no}-{now:%Y-%m-%d-%H%M}"
+def _shared_channel_title(session_no: int, at: Optional[datetime] = None) -> str:
+    # 秒まで入れて、同じ分に連続作成しても名前が重ならないようにする
+    now = at or datetime.now(JST)
+    return f"session{session_no}-{now:%Y%m%d-%H%M%S}"
+
+
+# 空白・スラッシュ → "-"、一部記号は除去（1回の translate で済ませる）
+_CHANNEL_NAME_TABLE = str.maketrans({
+    " ": "-", "/": "-", "\\": "-",
+    **dict.fromkeys("@#:,.。、’'\"“”()[]{}!?？"),
+})
+_MULTI_DASH_RE = re.compile(r"-{2,}")
 
 
 def _safe_name_for_channel(s: str) -> str:
     """
     Discordチャンネル名に安全に収まるように軽く整形。
-    display_name を元にするので、空白→-、一部記号除去、長さ制限。
+    display_name を元にするので、空白→-、一部記号除去、小文字化、長さ制限。
     """
-    s = s.strip()
-    s = s.replace(" ", "-").replace("/", "-").replace("\\", "-")
-    for ch in ["@", "#", ":", ",", ".", "。", "、", "’", "'", "\"", "“", "”",
-               "(", ")", "[", "]", "{", "}", "!", "?", "？"]:
-        s = s.replace(ch, "")
-
-    while "--" in s:
-        s = s.replace("--", "-")
+    s = s.strip().lower().translate(_CHANNEL_NAME_TABLE)
+    s = _MULTI_DASH_RE.sub("-", s)
 
     if not s:
         s = "user"
@@ -84,70 +125,58 @@ def _individual_channel_title(member: discord.Member) -> str:
 # -----------------------
 # Views
 # -----------------------
+# custom_id = "setup:{action}:{session_no}" の action ごとのラベル/色
+_CREATE_BUTTONS = {
+    "shared_create": ("共有テキストch作成", discord.ButtonStyle.secondary),
+    "individual_create": ("個別テキストch作成", discord.ButtonStyle.primary),
+}
+
+
 class SetupView(discord.ui.View):
     """!setup 後のボタン群（セッション別：共有作成／個別作成）"""
     def __init__(self, cog: "SetupChannelsCog"):
         super().__init__(timeout=None)
         self.cog = cog
 
-        self.add_item(SharedCreateButton(cog, 1, row=0))
-        self.add_item(IndividualCreateButton(cog, 1, row=0))
-
-        self.add_item(SharedCreateButton(cog, 2, row=1))
-        self.add_item(IndividualCreateButton(cog, 2, row=1))
-
-        self.add_item(SharedCreateButton(cog, 3, row=2))
-        self.add_item(IndividualCreateButton(cog, 3, row=2))
+        for row, session_no in enumerate((1, 2, 3)):
+            for action in _CREATE_BUTTONS:
+                self.add_item(CreateButton(cog, action, session_no, row=row))
 
 
-class SharedCreateButton(discord.ui.Button):
-    def __init__(self, cog: "SetupChannelsCog", session_no: int, row: int):
+class CreateButton(discord.ui.Button):
+    def __init__(self, cog: "SetupChannelsCog", action: str, session_no: int, row: int):
+        label, style = _CREATE_BUTTONS[action]
         super().__init__(
-            label=f"セッション{session_no}：共有テキストch作成",
-            style=discord.ButtonStyle.secondary,
-            custom_id=f"setup:shared_create:{session_no}",
+            label=f"セッション{session_no}：{label}",
+            style=style,
+            custom_id=f"setup:{action}:{session_no}",
             row=row,
         )
         self.cog = cog
-        self.session_no = session_no
 
     async def callback(self, interaction: discord.Interaction):
-        await self.cog.handle_shared_create(interaction, self.session_no)
-
-
-class IndividualCreateButton(discord.ui.Button):
-    def __init__(self, cog: "SetupChannelsCog", session_no: int, row: int):
-        super().__init__(
-            label=f"セッション{session_no}：個別テキストch作成",
-            style=discord.ButtonStyle.primary,
-            custom_id=f"setup:individual_create:{session_no}",
-            row=row,
-        )
-        self.cog = cog
-        self.session_no = session_no
-
-    async def callback(self, interaction: discord.Interaction):
-        await self.cog.handle_individual_create(interaction, self.session_no)
+        _, action, session_no = self.custom_id.split(":")
+        await self.cog.handle_create(interaction, action, int(session_no))
 
 
 class DeleteView(discord.ui.View):
-    def __init__(self, cog: "SetupChannelsCog", channel_id: int):
+    """全チャンネル共通の削除ボタン。押されたチャンネル自身を削除する（Cogで1つだけ登録）。"""
+    def __init__(self, cog: "SetupChannelsCog"):
         super().__init__(timeout=None)
-        self.add_item(DeleteButton(cog, channel_id))
+        self.add_item(DeleteButton(cog))
 
 
 class DeleteButton(discord.ui.Button):
-    def __init__(self, cog: "SetupChannelsCog", channel_id: int):
+    def __init__(self, cog: "SetupChannelsCog"):
         super().__init__(
             label="このチャンネルを削除",
             style=discord.ButtonStyle.danger,
-            custom_id=f"setup:delete:{channel_id}",
+            custom_id=DELETE_CUSTOM_ID,
         )
         self.cog = cog
-        self.channel_id = channel_id
 
     async def callback(self, interaction: discord.Interaction):
-        await self.cog.handle_delete(interaction, self.channel_id)
+        await self.cog.handle_delete(interaction)
 
 
 # -----------------------
@@ -156,18 +185,116 @@ class DeleteButton(discord.ui.Button):
 class SetupChannelsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.db = _load_db()
-
-        # 永続View登録
-        self.bot.add_view(SetupView(self))
+        # メモリ上はチャンネルID(int)をキーにする（文字列化は保存時のみ）。読み込みは cog_load で
+        self.db: Dict[int, dict] = {}
+
+        # self.db が正。変更は _mark_dirty() で遅延書き込みする
+        self._dirty = False
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+        # config 由来のIDはロード時に一度だけ解決
+        self._vc_ids: Dict[int, int] = getattr(config, "SESSION_VC_IDS", {})
+        self._shared_cat_ids: Dict[int, int] = getattr(config, "SESSION_SHARED_CATEGORY_IDS", {})
+        self._individual_cat_ids: Dict[int, int] = getattr(config, "SESSION_INDIVIDUAL_CATEGORY_IDS", {})
+        self._spectator_role_id: Optional[int] = getattr(config, "SPECTATOR_ROLE_ID", None)
+
+        # (カテゴリID, チャンネル名) -> テキストchID。同名統合の検索用
+        # _indexed_categories のカテゴリは全テキストchが載っていて、チャンネルイベントで追従する
+        # （切断中の変更は届かないので、再接続時に捨てて作り直す）
+        self._name_index: Dict[Tuple[int, str], int] = {}
+        self._indexed_categories: set[int] = set()
+
+        # 永続View登録（!setup のパネルも削除ボタンも1インスタンスを使い回す）
+        self._setup_view = SetupView(self)
+        self.bot.add_view(self._setup_view)
+        self._delete_view = DeleteView(self)
+        self.bot.add_view(self._delete_view)
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction):
+        # 旧形式の削除ボタン（custom_id = "setup:delete:{channel_id}"）。
+        # どれも対象チャンネル自身に投稿されているので、押されたチャンネルを削除すればよい
+        if interaction.type is not discord.InteractionType.component:
+            return
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        if custom_id.startswith(LEGACY_DELETE_CUSTOM_ID_PREFIX):
+            await self.handle_delete(interaction)
+
+    # 名前索引をチャンネルの作成/削除/改名・移動に追従させる
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._reset_name_index()
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        self._reset_name_index()
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self._index_add(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self._index_remove(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.name != after.name or before.category_id != after.category_id:
+            self._index_remove(before)
+            self._index_add(after)
+
+    async def cog_load(self) -> None:
+        raw = await asyncio.to_thread(_load_db)
+        # JSON のキーは文字列なのでチャンネルIDに戻す（数字でないキーは読み飛ばす）
+        self.db = {int(k): v for k, v in raw.items() if k.isascii() and k.isdigit()}
+
+    async def cog_unload(self) -> None:
+        # リロード/終了時は保留中の変更をその場で書き出す
+        # 書き込み中の _flush と同じ一時ファイルを触らないようロックを取って待つ
+        self._cancel_flush_timer()
+        async with self._save_lock:
+            await self._write_if_dirty()
+        self._cancel_flush_timer()  # 待っている間に失敗→再予約されたタイマーも止める
 
-        # 既存削除ボタン復元
-        for ch_id_str in list(self.db.keys()):
-            try:
-                ch_id = int(ch_id_str)
-            except ValueError:
-                continue
-            self.bot.add_view(DeleteView(self, ch_id))
+    # -----------------
+    # DB persistence
+    # -----------------
+    def _mark_dirty(self) -> None:
+        """DB変更を記録し、SAVE_DELAY_SEC 後に1回だけ書き込む（連続変更はまとめる）。"""
+        self._dirty = True
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(SAVE_DELAY_SEC, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self._flush())
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    async def _write_if_dirty(self) -> bool:
+        """_save_lock を持った状態で呼ぶ。失敗したら dirty に戻してログを出す。"""
+        if not self._dirty:
+            return True
+        self._dirty = False
+        try:
+            await _asave_db(self.db)
+        except Exception as e:
+            self._dirty = True
+            print(f"[NG] {DB_PATH} の保存に失敗しました -> {type(e).__name__}: {e}")
+            return False
+        return True
+
+    async def _flush(self) -> None:
+        async with self._save_lock:
+            ok = await self._write_if_dirty()
+        if not ok:
+            self._mark_dirty()  # 変更は捨てずに SAVE_DELAY_SEC 後に再試行
 
     @commands.command(name="setup")
     async def setup_cmd(self, ctx: commands.Context):
@@ -175,6 +302,11 @@ class SetupChannelsCog(commands.Cog):
             await ctx.reply("このコマンドは専用チャンネルで使用してください。", mention_author=False)
             return
 
+        # ボタンを押しても作成できない人にはパネルを出さない
+        if not isinstance(ctx.author, discord.Member) or not _is_adminish(ctx.author):
+            await ctx.reply("管理者のみ実行できます。", mention_author=False)
+            return
+
         embed = discord.Embed(
             title="セットアップ",
             description=(
@@ -185,82 +317,129 @@ class SetupChannelsCog(commands.Cog):
                 "※ すべてのチャンネルに削除ボタンが付きます。"
             ),
         )
-        await ctx.send(embed=embed, view=SetupView(self))
+        await ctx.send(embed=embed, view=self._setup_view)
 
     def _get_session_vc(self, guild: discord.Guild, session_no: int) -> Optional[discord.VoiceChannel]:
-        vc_id = getattr(config, "SESSION_VC_IDS", {}).get(session_no)
+        vc_id = self._vc_ids.get(session_no)
         ch = guild.get_channel(vc_id) if vc_id else None
         return ch if isinstance(ch, discord.VoiceChannel) else None
 
     def _get_spectator_role(self, guild: discord.Guild) -> Optional[discord.Role]:
-        rid = getattr(config, "SPECTATOR_ROLE_ID", None)
+        rid = self._spectator_role_id
         return guild.get_role(rid) if rid else None
 
     def _get_shared_category(self, guild: discord.Guild, session_no: int) -> Optional[discord.CategoryChannel]:
-        cid = getattr(config, "SESSION_SHARED_CATEGORY_IDS", {}).get(session_no)
+        cid = self._shared_cat_ids.get(session_no)
         ch = guild.get_channel(cid) if cid else None
         return ch if isinstance(ch, discord.CategoryChannel) else None
 
     def _get_individual_category(self, guild: discord.Guild, session_no: int) -> Optional[discord.CategoryChannel]:
-        cid = getattr(config, "SESSION_INDIVIDUAL_CATEGORY_IDS", {}).get(session_no)
+        cid = self._individual_cat_ids.get(session_no)
         ch = guild.get_channel(cid) if cid else None
         return ch if isinstance(ch, discord.CategoryChannel) else None
 
+    def _find_text_channel(
+        self, guild: discord.Guild, category: discord.CategoryChannel, name: str
+    ) -> Optional[discord.TextChannel]:
+        if category.id not in self._indexed_categories:
+            self._build_category_index(category)
+
+        key = (category.id, name)
+        ch_id = self._name_index.get(key)
+        if ch_id is None:
+            return None  # 索引済みカテゴリでの miss はそのまま信用できる
+
+        ch = guild.get_channel(ch_id)
+        # 念のため名前/カテゴリも確認（ずれていたら別チャンネルに権限を付けないよう作り直す）
+        if isinstance(ch, discord.TextChannel) and ch.name == name and ch.category_id == category.id:
+            return ch
+        del self._name_index[key]
+        self._build_category_index(category)
+        ch_id = self._name_index.get(key)
+        return guild.get_channel(ch_id) if ch_id is not None else None
+
+    def _build_category_index(self, category: discord.CategoryChannel) -> None:
+        # カテゴリ内を1回だけ走査して索引を作る（同名が複数あれば先頭を採用）
+        seen = set()
+        for c in category.text_channels:
+            key = (category.id, c.name)
+            if key not in seen:
+                seen.add(key)
+                self._name_index[key] = c.id
+        self._indexed_categories.add(category.id)
+
+    def _reset_name_index(self) -> None:
+        self._name_index.clear()
+        self._indexed_categories.clear()
+
+    def _index_add(self, ch: discord.abc.GuildChannel) -> None:
+        if isinstance(ch, discord.TextChannel) and ch.category_id in self._indexed_categories:
+            self._name_index.setdefault((ch.category_id, ch.name), ch.id)
+
+    def _index_remove(self, ch: discord.abc.GuildChannel) -> None:
+        key = (ch.category_id, ch.name)
+        if self._name_index.get(key) == ch.id:
+            del self._name_index[key]
+            # 同名の別チャンネルが残っているかもしれないので、次回このカテゴリを作り直す
+            self._indexed_categories.discard(ch.category_id)
+
+    async def _fail(self, interaction: discord.Interaction, msg: str) -> None:
+        # defer 済みのインタラクションにエラーを本人だけに返す
+        await interaction.followup.send(msg, ephemeral=True)
+
+    async def handle_create(self, interaction: discord.Interaction, action: str, session_no: int):
+        if action == "shared_create":
+            await self.handle_shared_create(interaction, session_no)
+        else:
+            await self.handle_individual_create(interaction, session_no)
+
     # -----------------
     # Shared create
     # -----------------
     async def handle_shared_create(self, interaction: discord.Interaction, session_no: int):
+        now = datetime.now(JST)
         await interaction.response.defer(ephemeral=True)
 
         guild = interaction.guild
         if guild is None:
-            await interaction.followup.send("サーバー内で実行してください。", ephemeral=True)
+            await self._fail(interaction, "サーバー内で実行してください。")
             return
 
         invoker = interaction.user
         if not isinstance(invoker, discord.Member):
-            await interaction.followup.send("メンバー情報が取得できませんでした。", ephemeral=True)
+            await self._fail(interaction, "メンバー情報が取得できませんでした。")
             return
 
         vc = self._get_session_vc(guild, session_no)
         if vc is None:
-            await interaction.followup.send("セッションVCが見つかりません（ID設定を確認）。", ephemeral=True)
+            await self._fail(interaction, "セッションVCが見つかりません（ID設定を確認）。")
             return
 
-        vc_members: List[discord.Member] = list(vc.members)
-        if not vc_members:
-            await interaction.followup.send("そのVCに誰もいません。作成できません。", ephemeral=True)
+        # VoiceChannel.members は呼ぶたびに voice_states を走査するので、1回の走査で上書き設定まで作る
+        member_ows: Dict[discord.Member, discord.PermissionOverwrite] = {m: _OW_MEMBER for m in vc.members}
+        if not member_ows:
+            await self._fail(interaction, "そのVCに誰もいません。作成できません。")
             return
 
         category = self._get_shared_category(guild, session_no)
         if category is None:
-            await interaction.followup.send("共有ch作成先カテゴリが見つかりません（SESSION_SHARED_CATEGORY_IDSを確認）。", ephemeral=True)
+            await self._fail(interaction, "共有ch作成先カテゴリが見つかりません（SESSION_SHARED_CATEGORY_IDSを確認）。")
             return
 
         spectator = self._get_spectator_role(guild)
         if spectator is None:
-            await interaction.followup.send("見学ロールが見つかりません（SPECTATOR_ROLE_IDを確認）。", ephemeral=True)
+            await self._fail(interaction, "見学ロールが見つかりません（SPECTATOR_ROLE_IDを確認）。")
             return
 
-        name = _shared_channel_title(session_no)
-
-        overwrites = {guild.default_role: discord.PermissionOverwrite(view_channel=False)}
+        name = _shared_channel_title(session_no, now)
 
-        # 見学ロール：閲覧/チャット可
-        overwrites[spectator] = discord.PermissionOverwrite(
-            view_channel=True, read_message_history=True, send_messages=True
-        )
-
-        # 実行者：閲覧/チャット可
-        overwrites[invoker] = discord.PermissionOverwrite(
-            view_channel=True, read_message_history=True, send_messages=True
-        )
-
-        # VC参加者：閲覧/チャット可
-        for m in vc_members:
-            overwrites[m] = discord.PermissionOverwrite(
-                view_channel=True, read_message_history=True, send_messages=True
-            )
+        # 見学ロール / 実行者 / VC参加者：閲覧/チャット可
+        overwrites = {
+            guild.default_role: _OW_HIDDEN,
+            spectator: _OW_MEMBER,
+            invoker: _OW_MEMBER,
+            **member_ows,
+        }
 
         try:
             text_ch = await guild.create_text_channel(
@@ -270,17 +449,16 @@ class SetupChannelsCog(commands.Cog):
                 reason=f"setup shared session {session_no} by {invoker}",
             )
         except discord.Forbidden:
-            await interaction.followup.send("権限不足で共有テキストchを作成できません。", ephemeral=True)
+            await self._fail(interaction, "権限不足で共有テキストchを作成できません。")
             return
 
-        self.db[str(text_ch.id)] = {
+        self.db[text_ch.id] = {
             "guild_id": guild.id,
             "creator_id": invoker.id,
             "session_no": session_no,
             "type": "shared",
         }
-        _save_db(self.db)
-        self.bot.add_view(DeleteView(self, text_ch.id))
+        self._mark_dirty()
 
         embed = discord.Embed(
             title="共有テキストチャンネル",
@@ -290,7 +468,7 @@ class SetupChannelsCog(commands.Cog):
                 "削除する場合は下のボタンを押してください。"
             ),
         )
-        await text_ch.send(embed=embed, view=DeleteView(self, text_ch.id))
+        await text_ch.send(embed=embed, view=self._delete_view)
 
         await interaction.followup.send(f"✅ 共有テキストchを作成しました：{text_ch.mention}", ephemeral=True)
 
@@ -302,130 +480,150 @@ class SetupChannelsCog(commands.Cog):
 
         guild = interaction.guild
         if guild is None:
-            await interaction.followup.send("サーバー内で実行してください。", ephemeral=True)
+            await self._fail(interaction, "サーバー内で実行してください。")
             return
 
         invoker = interaction.user
         if not isinstance(invoker, discord.Member):
-            await interaction.followup.send("メンバー情報が取得できませんでした。", ephemeral=True)
+            await self._fail(interaction, "メンバー情報が取得できませんでした。")
             return
 
         vc = self._get_session_vc(guild, session_no)
         if vc is None:
-            await interaction.followup.send("セッションVCが見つかりません（ID設定を確認）。", ephemeral=True)
+            await self._fail(interaction, "セッションVCが見つかりません（ID設定を確認）。")
             return
 
-        vc_members: List[discord.Member] = list(vc.members)
+        vc_members: List[discord.Member] = vc.members
         if not vc_members:
-            await interaction.followup.send("そのVCに誰もいません。作成できません。", ephemeral=True)
+            await self._fail(interaction, "そのVCに誰もいません。作成できません。")
             return
 
         category = self._get_individual_category(guild, session_no)
         if category is None:
-            await interaction.followup.send("個別ch作成先カテゴリが見つかりません（SESSION_INDIVIDUAL_CATEGORY_IDSを確認）。", ephemeral=True)
+            await self._fail(interaction, "個別ch作成先カテゴリが見つかりません（SESSION_INDIVIDUAL_CATEGORY_IDSを確認）。")
             return
 
         spectator = self._get_spectator_role(guild)
         if spectator is None:
-            await interaction.followup.send("見学ロールが見つかりません（SPECTATOR_ROLE_IDを確認）。", ephemeral=True)
+            await self._fail(interaction, "見学ロールが見つかりません（SPECTATOR_ROLE_IDを確認）。")
             return
 
         created = 0
         merged = 0
         failed: List[str] = []
 
+        # VC表示名依存のチャンネル名。同名になる参加者はまとめて1チャンネルで処理（同名衝突 → 統合）
+        groups: Dict[str, List[discord.Member]] = {}
         for target in vc_members:
-            # VC表示名依存のチャンネル名
-            ch_name = _individual_channel_title(target)
+            groups.setdefault(_individual_channel_title(target), []).append(target)
+
+        sem = asyncio.Semaphore(CREATE_CONCURRENCY)
 
-            # ★同名衝突を「統合」にする：既存があればそれを使う
-            existing = discord.utils.get(guild.text_channels, name=ch_name, category=category)
+        async def _make_one(ch_name: str, targets: List[discord.Member]) -> Tuple[discord.TextChannel, bool]:
+            async with sem:
+                # ★同名衝突を「統合」にする：既存があればそれを使う
+                existing = self._find_text_channel(guild, category, ch_name)
 
-            try:
                 if existing:
-                    # 既存の上書きに target を追加（既存の許可を壊さないように update）
+                    # 既存の上書きに targets を追加（既存の許可を壊さないように update）
                     overwrites = dict(existing.overwrites)
 
-                    overwrites[guild.default_role] = discord.PermissionOverwrite(view_channel=False)
-
-                    # 見学：閲覧/チャット可
-                    overwrites[spectator] = discord.PermissionOverwrite(
-                        view_channel=True, read_message_history=True, send_messages=True
-                    )
-
-                    # setup実行者：閲覧/チャット可
-                    overwrites[invoker] = discord.PermissionOverwrite(
-                        view_channel=True, read_message_history=True, send_messages=True
-                    )
+                    overwrites[guild.default_role] = _OW_HIDDEN
 
-                    # 追加対象：閲覧/チャット可
-                    overwrites[target] = discord.PermissionOverwrite(
-                        view_channel=True, read_message_history=True, send_messages=True
-                    )
+                    # 見学 / setup実行者 / 追加対象：閲覧/チャット可
+                    overwrites[spectator] = _OW_MEMBER
+                    overwrites[invoker] = _OW_MEMBER
+                    overwrites.update({t: _OW_MEMBER for t in targets})
 
                     await existing.edit(overwrites=overwrites, reason="merge same-name individual channel")
-                    text_ch = existing
-                    merged += 1
-                else:
-                    overwrites = {
-                        guild.default_role: discord.PermissionOverwrite(view_channel=False),
-                        spectator: discord.PermissionOverwrite(
-                            view_channel=True, read_message_history=True, send_messages=True
-                        ),
-                        invoker: discord.PermissionOverwrite(
-                            view_channel=True, read_message_history=True, send_messages=True
-                        ),
-                        target: discord.PermissionOverwrite(
-                            view_channel=True, read_message_history=True, send_messages=True
-                        ),
-                    }
-
-                    text_ch = await guild.create_text_channel(
-                        name=ch_name,
-                        category=category,
-                        overwrites=overwrites,
-                        reason=f"setup individual session {session_no} target {target.id} by {invoker.id}",
-                    )
-                    created += 1
-
-                # DB登録（target_member_ids を配列で保持して統合を追跡）
-                rec = self.db.get(str(text_ch.id))
-                if not rec:
-                    rec = {
-                        "guild_id": guild.id,
-                        "creator_id": invoker.id,
-                        "session_no": session_no,
-                        "type": "individual",
-                        "target_member_ids": [],
-                    }
-                    self.db[str(text_ch.id)] = rec
-
-                # creator_id は最初の作成者を基本とする（統合時は変えない）
-                ids = rec.get("target_member_ids", [])
-                if target.id not in ids:
-                    ids.append(target.id)
-                    rec["target_member_ids"] = ids
-
-                _save_db(self.db)
-                self.bot.add_view(DeleteView(self, text_ch.id))
-
-                # 案内投稿（統合チャンネルでは「追加したよ」でもOK）
-                embed = discord.Embed(
-                    title=f"個別テキストチャンネル：{text_ch.name}",
-                    description=(
-                        f"セッション{session_no} / 対象VC：{vc.mention}\n"
-                        f"追加：{target.mention}\n"
-                        f"作成者：{invoker.mention}\n"
-                        f"見学：{spectator.mention}（閲覧/チャット可）\n\n"
-                        "削除する場合は下のボタンを押してください。"
-                    ),
+                    return existing, False
+
+                overwrites = {
+                    guild.default_role: _OW_HIDDEN,
+                    spectator: _OW_MEMBER,
+                    invoker: _OW_MEMBER,
+                    **{t: _OW_MEMBER for t in targets},
+                }
+
+                text_ch = await guild.create_text_channel(
+                    name=ch_name,
+                    category=category,
+                    overwrites=overwrites,
+                    reason=f"setup individual session {session_no} target {targets[0].id} by {invoker.id}",
                 )
-                await text_ch.send(embed=embed, view=DeleteView(self, text_ch.id))
+                self._index_add(text_ch)
+                return text_ch, True
 
-            except discord.Forbidden:
-                failed.append(target.display_name)
-            except Exception:
-                failed.append(target.display_name)
+        results = await asyncio.gather(
+            *(_make_one(name, targets) for name, targets in groups.items()),
+            return_exceptions=True,
+        )
+
+        # DB登録は全件まとめて（target_member_ids を配列で保持して統合を追跡）
+        done: List[Tuple[discord.TextChannel, List[discord.Member], dict]] = []
+        for targets, result in zip(groups.values(), results):
+            if isinstance(result, BaseException):
+                failed.extend(t.display_name for t in targets)
+                continue
+
+            text_ch, is_new = result
+            if is_new:
+                created += 1
+                merged += len(targets) - 1
+            else:
+                merged += len(targets)
+
+            rec = self.db.get(text_ch.id)
+            if not rec:
+                rec = {
+                    "guild_id": guild.id,
+                    "creator_id": invoker.id,
+                    "session_no": session_no,
+                    "type": "individual",
+                    "target_member_ids": [],
+                }
+                self.db[text_ch.id] = rec
+
+            # creator_id は最初の作成者を基本とする（統合時は変えない）
+            ids = rec.get("target_member_ids", [])
+            for t in targets:
+                if t.id not in ids:
+                    ids.append(t.id)
+            rec["target_member_ids"] = ids
+
+            done.append((text_ch, targets, rec))
+
+        async def _announce(text_ch: discord.TextChannel, rec: dict) -> None:
+            # 案内は1チャンネル1投稿。統合時は前回の案内を編集して対象を追記する
+            embed = discord.Embed(
+                title=f"個別テキストチャンネル：{text_ch.name}",
+                description=(
+                    f"セッション{session_no} / 対象VC：{vc.mention}\n"
+                    f"対象：{' '.join(f'<@{i}>' for i in rec['target_member_ids'])}\n"
+                    f"作成者：<@{rec['creator_id']}>\n"
+                    f"見学：{spectator.mention}（閲覧/チャット可）\n\n"
+                    "削除する場合は下のボタンを押してください。"
+                ),
+            )
+            mid = rec.get("notice_message_id")
+            if mid is not None:
+                try:
+                    await text_ch.get_partial_message(mid).edit(embed=embed)
+                    return
+                except discord.NotFound:
+                    pass  # 案内が消されていたら投稿し直す
+            notice = await text_ch.send(embed=embed, view=self._delete_view)
+            rec["notice_message_id"] = notice.id
+
+        # 投稿はチャンネルごとに別バケットなので並行で送る
+        sent = await asyncio.gather(*(_announce(ch, rec) for ch, _, rec in done), return_exceptions=True)
+        for (_, targets, _), result in zip(done, sent):
+            if isinstance(result, BaseException):
+                failed.extend(t.display_name for t in targets)
+
+        # 案内のメッセージIDも含めてまとめて保存
+        if done:
+            self._mark_dirty()
 
         msg = (
             f"✅ 個別テキストch処理完了（セッション{session_no}）\n"
@@ -439,42 +637,45 @@ class SetupChannelsCog(commands.Cog):
     # -----------------
     # Delete (all channels)
     # -----------------
-    async def handle_delete(self, interaction: discord.Interaction, channel_id: int):
-        await interaction.response.defer(ephemeral=True)
-
+    async def handle_delete(self, interaction: discord.Interaction):
+        # ここまでの判定は手元の情報だけで済むので、defer せず即時応答で返す
         guild = interaction.guild
         if guild is None:
-            await interaction.followup.send("サーバー内で実行してください。", ephemeral=True)
+            await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
             return
 
         member = interaction.user
         if not isinstance(member, discord.Member):
-            await interaction.followup.send("メンバー情報が取得できませんでした。", ephemeral=True)
+            await interaction.response.send_message("メンバー情報が取得できませんでした。", ephemeral=True)
             return
 
-        ch = guild.get_channel(channel_id)
-        if not isinstance(ch, discord.TextChannel):
-            if str(channel_id) in self.db:
-                self.db.pop(str(channel_id), None)
-                _save_db(self.db)
-            await interaction.followup.send("対象チャンネルが見つかりません（既に削除済みかも）。", ephemeral=True)
-            return
-
-        info = self.db.get(str(channel_id), {})
+        channel_id = interaction.channel_id
+        info = self.db.get(channel_id, {})
         creator_id = info.get("creator_id")
 
         if creator_id != member.id and not _is_adminish(member):
-            await interaction.followup.send("削除できるのは作成者または管理者のみです。", ephemeral=True)
+            await interaction.response.send_message("削除できるのは作成者または管理者のみです。", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        ch = guild.get_channel(channel_id)
+        if not isinstance(ch, discord.TextChannel):
+            if channel_id in self.db:
+                self.db.pop(channel_id, None)
+                self._mark_dirty()
+            await self._fail(interaction, "対象チャンネルが見つかりません（既に削除済みかも）。")
             return
 
         try:
             await ch.delete(reason=f"Deleted by {member} via delete button")
         except discord.Forbidden:
-            await interaction.followup.send("権限不足で削除できません。", ephemeral=True)
+            await self._fail(interaction, "権限不足で削除できません。")
             return
 
-        self.db.pop(str(channel_id), None)
-        _save_db(self.db)
+        self.db.pop(channel_id, None)
+        self._mark_dirty()
+        self._index_remove(ch)
 
         await interaction.followup.send("🗑 チャンネルを削除しました。", ephemeral=True)
 
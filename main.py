@@ -1,13 +1,23 @@
 import asyncio
+import importlib.util
+import os
+import signal
 import discord
 from discord.ext import commands
 
 import config
 
-COG_LIST = [
-    "cogs.export_html",
-    "cogs.setup_channels",
-]
+# BOT_COGS=cogs.export_html,cogs.setup_channels のようにカンマ区切りで上書きできる
+DEFAULT_COGS = "cogs.export_html,cogs.setup_channels"
+COG_LIST = [c.strip() for c in os.getenv("BOT_COGS", DEFAULT_COGS).split(",") if c.strip()]
+
+# discord.py[speed] で入る高速化用パッケージ（無くても動くが遅くなる）
+SPEED_MODULES = ("orjson", "aiodns", "brotli")
+
+def _preflight() -> None:
+    missing = [m for m in SPEED_MODULES if importlib.util.find_spec(m) is None]
+    if missing:
+        print(f"[WARN] discord.py[speed] の依存が見つかりません: {', '.join(missing)}")
 
 def build_intents() -> discord.Intents:
     intents = discord.Intents.default()
@@ -15,6 +25,9 @@ def build_intents() -> discord.Intents:
     intents.members = True
     return intents
 
+# 起動時に一度だけ組み立てて使い回す
+INTENTS = build_intents()
+
 class MyBot(commands.Bot):
     async def setup_hook(self) -> None:
         for ext in COG_LIST:
@@ -28,14 +41,39 @@ class MyBot(commands.Bot):
 async def main():
     if not config.TOKEN:
         raise RuntimeError("DISCORD_TOKEN が未設定です（Railway Variables を確認）")
+    _preflight()
 
-    bot = MyBot(command_prefix="!", intents=build_intents(), help_command=None)
+    bot = MyBot(command_prefix="!", intents=INTENTS, help_command=None)
 
     @bot.event
     async def on_ready():
         print(f"Logged in as: {bot.user} (id={bot.user.id})")
 
-    await bot.start(config.TOKEN)
+    # SIGTERM（再起動/デプロイ）でも bot.close() を通して cog_unload で保留中のDBを書き出す
+    loop = asyncio.get_running_loop()
+    closing: set = set()  # タスクがGCされないよう参照を持っておく
+
+    def _on_sigterm() -> None:
+        task = loop.create_task(bot.close())
+        closing.add(task)
+        task.add_done_callback(closing.discard)
+
+    try:
+        loop.add_signal_handler(signal.SIGTERM, _on_sigterm)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows では使えない（Ctrl+C は async with の後始末で閉じる）
+
+    async with bot:
+        await bot.start(config.TOKEN)
+
+def run() -> None:
+    # uvloop があれば使う（Windows や未インストール環境では標準ループのまま）
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()